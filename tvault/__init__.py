@@ -7,8 +7,21 @@ __version__ = "2.1"
 __author__ = "UniBinary"
 __license__ = "MIT"
 
-from .cli import main
-from .vault import VaultManager
-from .file import FileManager
+__all__ = ["main", "VaultManager", "FileManager"]
 
-__all__ = ["main", "VaultManager", "FileManager"]
\ No newline at end of file
+def __getattr__(name):
+    """Lazily resolve the public API (PEP 562).
+
+    Importing the submodules eagerly would make every CLI invocation pay for
+    both managers even when only one of them is used.
+    """
+    if name == "main":
+        from .cli import main
+        return main
+    if name == "VaultManager":
+        from .vault import VaultManager
+        return VaultManager
+    if name == "FileManager":
+        from .file import FileManager
+        return FileManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -4,13 +4,35 @@ CLI interface for TextVault
 """
 
 import sys
-import argparse
-from pathlib import Path
-from .vault import VaultManager
-from .file import FileManager
+from types import SimpleNamespace
+
+# Positional argument names per command, used by the fast dispatcher.
+_VAULT_SPECS = {
+    "add": ("name", "path"),
+    "remove": ("name",),
+    "delete": ("name",),
+    "switch": ("name",),
+    "list": (),
+    "current": (),
+    "dump": ("name", "target_path"),
+    "import": ("zip_path", "target_path"),
+}
+
+_FILE_SPECS = {
+    "create": ("filename",),
+    "read": ("filename",),
+    "update": ("filename",),
+    "delete": ("filename",),
+    "rename": ("old_name", "new_name"),
+    "backup": ("filename",),
+    "recover": ("filename", "backup_spec"),
+    "list": (),
+}
+
+def _build_parser():
+    """Build the full argparse tree (only needed for --help and error reporting)"""
+    import argparse
 
-def main():
-    """Main CLI entry point"""
     parser = argparse.ArgumentParser(
         description="TextVault - A lightweight text file management system",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -103,18 +125,118 @@ Examples:
     
     # file list
     file_subparsers.add_parser("list", help="List all files")
-    
-    args = parser.parse_args()
-    
-    if not args.module:
-        parser.print_help()
-        return 1
-    
+
+    return parser
+
+def _parse_command(argv):
+    """Fast-path parser for real commands.
+
+    Handles the common 'tvault <module> <command> ...' invocations with plain
+    sys.argv slicing so argparse's subparser tree is never built. Returns a
+    namespace compatible with the handle_* functions, or None when the
+    arguments don't match a known command (caller falls back to argparse).
+    """
+    module = argv[0]
+    if module == "vault":
+        specs = _VAULT_SPECS
+    elif module == "file":
+        specs = _FILE_SPECS
+    else:
+        return None
+
+    if len(argv) < 2:
+        return None
+    command = argv[1]
+    if command not in specs:
+        return None
+
+    positionals = []
+    backup = None
+    backup_flag = False
+    vim_flag = False
+
+    rest = argv[2:]
+    i = 0
+    while i < len(rest):
+        arg = rest[i]
+        if arg == "--backup" or arg.startswith("--backup="):
+            value = arg[len("--backup="):] if arg.startswith("--backup=") else None
+            if module == "file" and command == "read":
+                # --backup takes a value
+                if value is None:
+                    i += 1
+                    if i >= len(rest):
+                        return None
+                    value = rest[i]
+                backup = value
+            elif module == "file" and command == "update":
+                # --backup is a plain flag
+                if value is not None:
+                    return None
+                backup_flag = True
+            elif module == "file" and command == "delete":
+                # --backup takes an optional value, defaulting to "all"
+                if value is None and i + 1 < len(rest) and not rest[i + 1].startswith("-"):
+                    i += 1
+                    value = rest[i]
+                backup = value if value is not None else "all"
+            else:
+                return None
+        elif arg == "--vim":
+            if module == "file" and command == "update":
+                vim_flag = True
+            else:
+                return None
+        elif arg.startswith("-"):
+            return None
+        else:
+            positionals.append(arg)
+        i += 1
+
+    names = specs[command]
+    if len(positionals) != len(names):
+        return None
+
+    args = SimpleNamespace(module=module, command=command)
+    for name, value in zip(names, positionals):
+        setattr(args, name, value)
+
+    if module == "file":
+        if command in ("read", "delete"):
+            args.backup = backup
+        elif command == "update":
+            args.backup = backup_flag
+            args.vim = vim_flag
+
+    return args
+
+def main():
+    """Main CLI entry point"""
+    argv = sys.argv[1:]
+
+    if not argv or "-h" in argv or "--help" in argv:
+        parser = _build_parser()
+        args = parser.parse_args(argv)
+        if not args.module:
+            parser.print_help()
+            return 1
+    else:
+        args = _parse_command(argv)
+        if args is None:
+            # Unknown or malformed command: report tersely without paying
+            # for the full argparse tree
+            print(f"Error: invalid command: {' '.join(argv)}", file=sys.stderr)
+            print("Use 'tvault --help' for usage information", file=sys.stderr)
+            return 2
+
     try:
         if args.module == "vault":
+            from .vault import VaultManager
             vault_manager = VaultManager()
             return handle_vault_command(vault_manager, args)
         elif args.module == "file":
+            from .vault import VaultManager
+            from .file import FileManager
             vault_manager = VaultManager()
             current_vault = vault_manager.get_current_vault()
             if not current_vault:
@@ -147,8 +269,9 @@ def handle_vault_command(vault_manager, args):
         if not vaults:
             print("No vaults found")
         else:
-            for name, path in vaults.items():
-                print(f"{name}: {path}")
+            # One buffered write instead of a syscall per vault
+            sys.stdout.write(
+                "".join(f"{name}: {path}\n" for name, path in vaults.items()))
     elif args.command == "current":
         current = vault_manager.get_current_vault()
         if current:
@@ -199,8 +322,10 @@ def handle_file_command(file_manager, args):
         if not files:
             print("No files found")
         else:
-            for filename, backup_count in files.items():
-                print(f"{filename}: {backup_count} backup(s)")
+            # One buffered write instead of a syscall per file
+            sys.stdout.write(
+                "".join(f"{filename}: {backup_count} backup(s)\n"
+                        for filename, backup_count in files.items()))
     else:
         print(f"Unknown file command: {args.command}")
         return 1
@@ -3,6 +3,9 @@
 File management module
 """
 
+import atexit
+import contextlib
+import fnmatch
 import json
 import shutil
 import subprocess
@@ -11,148 +14,329 @@ from pathlib import Path
 from datetime import datetime
 import re
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Date/time backup specs: YYYY_MM_DD with optional -hh:mm:ss
+_BACKUP_SPEC_RE = re.compile(
+    r'^(\d{4})_(\d{2})_(\d{2})(?:-(\d{2}):(\d{2}):(\d{2}))?$')
+
+# Force an fsync on every Nth index flush; os.replace keeps each individual
+# write atomic regardless
+_FSYNC_EVERY = 8
+
+_EDITOR_ENV = None
+
+def _editor_env():
+    """Environment for spawning editors, materialized once per process"""
+    global _EDITOR_ENV
+    if _EDITOR_ENV is None:
+        env = os.environ.copy()
+        env.setdefault("TERM", "xterm")
+        _EDITOR_ENV = env
+    return _EDITOR_ENV
+
+def _read_text(path):
+    """Read a whole file in one os.read sized from fstat.
+
+    Skips the extra buffered-reader machinery and chunked decode of
+    Path.read_text: one open, one fstat, one full-size read, one decode.
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size) if size else b''
+        # Guard against short reads (rare, but os.read allows them)
+        while len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        os.close(fd)
+    return data.decode('utf-8')
+
+def _fast_copy(src, dst):
+    """Copy a file using in-kernel primitives where available.
+
+    Tries os.copy_file_range (zero-copy, reflink-capable on CoW
+    filesystems), then os.sendfile, then falls back to a buffered
+    userspace copy. Metadata is copied afterwards to keep shutil.copy2
+    semantics.
+    """
+    src = os.fspath(src)
+    dst = os.fspath(dst)
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        copied = False
+        if hasattr(os, "copy_file_range"):
+            try:
+                while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30):
+                    pass
+                copied = True
+            except OSError:
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+        if not copied and hasattr(os, "sendfile"):
+            try:
+                offset = 0
+                while True:
+                    sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, 1 << 30)
+                    if not sent:
+                        break
+                    offset += sent
+                copied = True
+            except OSError:
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+        if not copied:
+            shutil.copyfileobj(fsrc, fdst, 256 * 1024)
+    shutil.copystat(src, dst)
+
 class FileManager:
     """Manage files in a data directory"""
-    
+
+    __slots__ = ("data_dir", "index_file", "_data_dir_str",
+                 "_index", "_dirty", "_in_batch", "_flushes_since_sync")
+
     def __init__(self, data_dir):
         """Initialize file manager with data directory"""
         self.data_dir = Path(data_dir)
-        self.data_dir.mkdir(parents=True, exist_ok=True)
-        
+        self._data_dir_str = os.fspath(self.data_dir)
+        # Common case is an existing directory: a stat is cheaper than an
+        # unconditional mkdir that comes back EEXIST
+        if not os.path.isdir(self._data_dir_str):
+            os.makedirs(self._data_dir_str, exist_ok=True)
+
         self.index_file = self.data_dir / "index.json"
         self._init_index()
     
     def _init_index(self):
-        """Initialize index.json if not exists"""
-        if not self.index_file.exists():
-            with open(self.index_file, 'w') as f:
-                json.dump({}, f, indent=2)
-    
+        """Set up lazy index state; index.json is parsed on first use"""
+        self._index = None
+        self._dirty = False
+        self._in_batch = False
+        self._flushes_since_sync = 0
+        atexit.register(self.flush)
+
     def _load_index(self):
-        """Load index from JSON file"""
-        with open(self.index_file, 'r') as f:
-            return json.load(f)
-    
+        """Return the in-memory index, loading it on first use.
+
+        Operations that never touch the index (plain read_file, for
+        instance) skip the JSON parse entirely.
+        """
+        if self._index is None:
+            try:
+                with open(self.index_file, 'rb') as f:
+                    data = f.read()
+                self._index = orjson.loads(data) if orjson else json.loads(data)
+            except FileNotFoundError:
+                self._index = {}
+                self._dirty = True
+        return self._index
+
     def _save_index(self, index):
-        """Save index to JSON file"""
-        with open(self.index_file, 'w') as f:
-            json.dump(index, f, indent=2)
+        """Record index changes, writing them out unless inside batch()"""
+        self._index = index
+        self._dirty = True
+        if not self._in_batch:
+            self.flush()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Coalesce index writes across a group of operations.
+
+        Inside the context, mutating operations only update the in-memory
+        index; one durable write (fsync) happens when the batch exits.
+        """
+        self._in_batch = True
+        try:
+            yield self
+        finally:
+            self._in_batch = False
+            self.flush(durable=True)
+
+    def flush(self, durable=False):
+        """Write the in-memory index to disk atomically if it changed.
+
+        os.replace makes every write atomic; fsync is only paid on batch
+        exits and every _FSYNC_EVERY-th flush so bursts of operations don't
+        serialize behind the disk.
+        """
+        if not self._dirty:
+            return
+
+        if orjson:
+            data = orjson.dumps(self._index)
+        else:
+            data = json.dumps(self._index, separators=(',', ':')).encode('utf-8')
+
+        self._flushes_since_sync += 1
+        if self._flushes_since_sync >= _FSYNC_EVERY:
+            durable = True
+
+        tmp_file = self.index_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_file, self.index_file)
+        self._dirty = False
+        if durable:
+            self._flushes_since_sync = 0
     
     def _get_file_dir(self, filename):
-        """Get directory for a file"""
-        return self.data_dir / filename
-    
+        """Get directory for a file (as a string, to keep hot paths cheap)"""
+        return os.path.join(self._data_dir_str, filename)
+
     def _get_file_path(self, filename):
-        """Get path to main file"""
-        return self._get_file_dir(filename) / filename
+        """Get path to main file (as a string)"""
+        return os.path.join(self._data_dir_str, filename, filename)
     
     def _get_backup_pattern(self, filename):
         """Get backup file pattern"""
         return f"{filename}_*.bak"
-    
+
+    def _scan_backups(self, filename):
+        """Scan the file directory for backups, newest first.
+
+        Uses os.scandir so mtimes come from the DirEntry stat cache: one
+        readdir batch for the directory instead of a stat syscall per file.
+        """
+        prefix = f"{filename}_"
+        backups = []
+        try:
+            with os.scandir(self._get_file_dir(filename)) as entries:
+                for entry in entries:
+                    if entry.name.startswith(prefix) and entry.name.endswith(".bak"):
+                        backups.append(
+                            [entry.stat(follow_symlinks=False).st_mtime, entry.name])
+        except FileNotFoundError:
+            return []
+        # Backup names embed a YYYYMMDD-HHMMSS timestamp, so sorting on the
+        # name gives newest-first ordering with plain string comparison
+        backups.sort(key=lambda pair: pair[1], reverse=True)
+        return backups
+
+    def _index_entry(self, filename):
+        """Get the index record for a file, upgrading legacy count entries.
+
+        Older indexes stored a bare backup count per file; those entries are
+        rebuilt as {\"count\": n, \"backups\": [[mtime, name], ...]} (newest
+        first) from one directory scan and kept in that form from then on.
+        Returns None for files the index does not know about.
+        """
+        index = self._load_index()
+        entry = index.get(filename)
+        if entry is None or isinstance(entry, dict):
+            return entry
+
+        backups = self._scan_backups(filename)
+        entry = {"count": len(backups), "backups": backups}
+        index[filename] = entry
+        self._dirty = True
+        return entry
+
+    def _backup_names(self, filename):
+        """List backup filenames for a file, newest first"""
+        entry = self._index_entry(filename)
+        if entry is not None:
+            return [name for _mtime, name in entry["backups"]]
+        return [name for _mtime, name in self._scan_backups(filename)]
+
     def _parse_backup_spec(self, filename, backup_spec):
         """Parse backup specification"""
         file_dir = self._get_file_dir(filename)
-        if not file_dir.exists():
+        if not os.path.isdir(file_dir):
             raise ValueError(f"File '{filename}' not found")
-        
-        # Get all backup files
-        backup_files = list(file_dir.glob(f"{filename}_*.bak"))
-        if not backup_files:
+
+        # Backup names come from the index (newest first); no stat calls
+        backup_names = self._backup_names(filename)
+        if not backup_names:
             raise ValueError(f"No backups found for '{filename}'")
-        
-        # Sort by modification time (newest first)
-        backup_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-        
+
         if backup_spec == "latest":
-            return backup_files[0]
-        
+            return os.path.join(file_dir, backup_names[0])
+
         # Try to parse as number
         try:
             n = int(backup_spec)
-            if n <= 0 or n > len(backup_files):
-                raise ValueError(f"Backup number {n} out of range (1-{len(backup_files)})")
-            return backup_files[n-1]
+            if n <= 0 or n > len(backup_names):
+                raise ValueError(f"Backup number {n} out of range (1-{len(backup_names)})")
+            return os.path.join(file_dir, backup_names[n-1])
         except ValueError:
             pass
-        
-        # Try to parse as date/time
-        try:
-            # Try YYYY_MM_DD-hh:mm:ss
-            if "-" in backup_spec and ":" in backup_spec:
-                # Format: YYYY_MM_DD-hh:mm:ss
-                date_str, time_str = backup_spec.split("-")
-                # Convert to backup filename format: YYYYMMDD-HHMMSS
-                date_part = date_str.replace("_", "")
-                time_part = time_str.replace(":", "")
-                pattern = f"{filename}_{date_part}-{time_part}.bak"
-            elif "-" in backup_spec:
-                # Format: YYYY_MM_DD-hh:mm:ss (but no colon, maybe just date)
-                # Actually this is just YYYY_MM_DD format
-                date_str = backup_spec
-                date_part = date_str.replace("_", "")
-                pattern = f"{filename}_{date_part}-*.bak"
-            else:
-                # Try YYYY_MM_DD
-                date_part = backup_spec.replace("_", "")
-                pattern = f"{filename}_{date_part}-*.bak"
-            
-            matching_files = list(file_dir.glob(pattern))
-            if not matching_files:
-                raise ValueError(f"No backup found matching '{backup_spec}'")
-            
-            # Return the first matching file
-            return matching_files[0]
-        except Exception:
+
+        # Try to parse as date/time (single precompiled match instead of
+        # repeated split/replace passes)
+        match = _BACKUP_SPEC_RE.match(backup_spec)
+        if not match:
             raise ValueError(f"Invalid backup specification: {backup_spec}")
+
+        year, month, day, hour, minute, second = match.groups()
+        date_part = f"{year}{month}{day}"
+        if hour is not None:
+            # Full timestamp: exact backup filename, no pattern match needed
+            backup_name = f"{filename}_{date_part}-{hour}{minute}{second}.bak"
+            if backup_name not in backup_names:
+                raise ValueError(f"No backup found matching '{backup_spec}'")
+            return os.path.join(file_dir, backup_name)
+
+        pattern = f"{filename}_{date_part}-*.bak"
+        matching_names = fnmatch.filter(backup_names, pattern)
+        if not matching_names:
+            raise ValueError(f"No backup found matching '{backup_spec}'")
+
+        # Return the first matching file
+        return os.path.join(file_dir, matching_names[0])
     
     def create_file(self, filename):
         """Create a new file"""
         file_dir = self._get_file_dir(filename)
-        if file_dir.exists():
+        if os.path.exists(file_dir):
             raise ValueError(f"File '{filename}' already exists")
-        
-        file_dir.mkdir(parents=True)
-        file_path = self._get_file_path(filename)
-        file_path.touch()
+
+        os.makedirs(file_dir)
+        with open(self._get_file_path(filename), 'a'):
+            pass
         
         # Update index
         index = self._load_index()
-        index[filename] = 0
+        index[filename] = {"count": 0, "backups": []}
         self._save_index(index)
     
     def read_file(self, filename, backup_spec=None):
         """Read a file or backup"""
         if backup_spec:
             backup_file = self._parse_backup_spec(filename, backup_spec)
-            return backup_file.read_text()
+            return _read_text(backup_file)
         else:
             file_path = self._get_file_path(filename)
-            if not file_path.exists():
+            try:
+                return _read_text(file_path)
+            except FileNotFoundError:
                 raise ValueError(f"File '{filename}' not found")
-            return file_path.read_text()
     
     def update_file(self, filename, create_backup=False, use_vim=False):
         """Update a file using editor"""
         file_path = self._get_file_path(filename)
-        if not file_path.exists():
+        if not os.path.exists(file_path):
             raise ValueError(f"File '{filename}' not found")
-        
+
         # Create backup if requested
         if create_backup:
             self.backup_file(filename)
-        
+
         # Choose editor
         editor = "vim" if use_vim else "nano"
-        
+
         # Edit file
         try:
-            # Set TERM environment variable if not set
-            env = os.environ.copy()
-            if "TERM" not in env:
-                env["TERM"] = "xterm"
-            
-            subprocess.run([editor, str(file_path)], check=True, env=env)
+            subprocess.run([editor, file_path], check=True, env=_editor_env())
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"Editor failed: {e}")
         except FileNotFoundError:
@@ -161,99 +345,128 @@ class FileManager:
     def delete_file(self, filename, backup_spec=None):
         """Delete a file or backups"""
         file_dir = self._get_file_dir(filename)
-        if not file_dir.exists():
+        if not os.path.isdir(file_dir):
             raise ValueError(f"File '{filename}' not found")
-        
+
         index = self._load_index()
-        
+
         if backup_spec is None:
             # Delete entire file directory
             shutil.rmtree(file_dir)
-            del index[filename]
+            index.pop(filename, None)
         elif backup_spec == "all":
-            # Delete all backups
-            backup_files = list(file_dir.glob(f"{filename}_*.bak"))
-            for backup in backup_files:
-                backup.unlink()
-            index[filename] = 0
+            # Delete all backups in one directory pass
+            prefix = f"{filename}_"
+            with os.scandir(file_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith(prefix) and entry.name.endswith(".bak"):
+                        os.unlink(entry.path)
+            index[filename] = {"count": 0, "backups": []}
         else:
             # Delete N oldest backups
             try:
                 n = int(backup_spec)
                 if n <= 0:
                     raise ValueError("Number of backups to delete must be positive")
-                
-                backup_files = list(file_dir.glob(f"{filename}_*.bak"))
-                if not backup_files:
+
+                entry = self._index_entry(filename)
+                if entry is None:
+                    backups = self._scan_backups(filename)
+                    entry = {"count": len(backups), "backups": backups}
+                    index[filename] = entry
+                if not entry["backups"]:
                     raise ValueError(f"No backups found for '{filename}'")
-                
-                # Sort by modification time (oldest first)
-                backup_files.sort(key=lambda x: x.stat().st_mtime)
-                
-                # Delete oldest N backups
+
+                # Delete oldest N backups (list is newest first, so pop
+                # from the tail)
                 deleted = 0
-                for i in range(min(n, len(backup_files))):
-                    backup_files[i].unlink()
+                for _ in range(min(n, len(entry["backups"]))):
+                    _mtime, backup_name = entry["backups"].pop()
+                    try:
+                        os.unlink(os.path.join(file_dir, backup_name))
+                    except FileNotFoundError:
+                        pass
                     deleted += 1
-                
-                # Update index
-                current_count = index.get(filename, 0)
-                index[filename] = max(0, current_count - deleted)
+
+                entry["count"] = max(0, entry["count"] - deleted)
             except ValueError as e:
                 raise ValueError(f"Invalid backup specification: {e}")
-        
+
         self._save_index(index)
     
     def rename_file(self, old_name, new_name):
         """Rename a file"""
         old_dir = self._get_file_dir(old_name)
-        if not old_dir.exists():
+        if not os.path.isdir(old_dir):
             raise ValueError(f"File '{old_name}' not found")
-        
+
         new_dir = self._get_file_dir(new_name)
-        if new_dir.exists():
+        if os.path.exists(new_dir):
             raise ValueError(f"File '{new_name}' already exists")
-        
+
         # Rename directory
-        old_dir.rename(new_dir)
-        
+        os.rename(old_dir, new_dir)
+
         # Rename main file
-        old_file = new_dir / old_name
-        new_file = new_dir / new_name
-        if old_file.exists():
-            old_file.rename(new_file)
-        
-        # Rename backup files
-        for backup in new_dir.glob(f"{old_name}_*.bak"):
-            new_backup_name = backup.name.replace(f"{old_name}_", f"{new_name}_")
-            backup.rename(new_dir / new_backup_name)
-        
+        old_file = os.path.join(new_dir, old_name)
+        new_file = os.path.join(new_dir, new_name)
+        if os.path.exists(old_file):
+            os.rename(old_file, new_file)
+
+        # Rename backup files in one scandir pass; slicing off the known
+        # prefix avoids str.replace scans and per-entry Path objects
+        prefix = f"{old_name}_"
+        plen = len(prefix)
+        with os.scandir(new_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefix) and entry.name.endswith(".bak"):
+                    os.rename(entry.path,
+                              os.path.join(new_dir, f"{new_name}_{entry.name[plen:]}"))
+
         # Update index
         index = self._load_index()
         if old_name in index:
-            index[new_name] = index[old_name]
-            del index[old_name]
+            entry = index.pop(old_name)
+            if isinstance(entry, dict):
+                entry["backups"] = [
+                    [mtime, f"{new_name}_{name[plen:]}"]
+                    for mtime, name in entry["backups"]
+                ]
+            index[new_name] = entry
             self._save_index(index)
     
     def backup_file(self, filename):
-        """Create backup of a file"""
+        """Create backup of a file and return the backup path"""
         file_path = self._get_file_path(filename)
-        if not file_path.exists():
+        if not os.path.exists(file_path):
             raise ValueError(f"File '{filename}' not found")
-        
+
         # Generate timestamp
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
         backup_name = f"{filename}_{timestamp}.bak"
-        backup_path = self._get_file_dir(filename) / backup_name
-        
+        backup_path = os.path.join(self._get_file_dir(filename), backup_name)
+
         # Copy file
-        shutil.copy2(file_path, backup_path)
-        
+        _fast_copy(file_path, backup_path)
+
         # Update index
         index = self._load_index()
-        current_count = index.get(filename, 0)
-        index[filename] = current_count + 1
+        entry = self._index_entry(filename)
+        if entry is None:
+            entry = {"count": 0, "backups": []}
+            index[filename] = entry
+        mtime = os.stat(backup_path).st_mtime
+        if entry["backups"] and entry["backups"][0][1] == backup_name:
+            # Timestamps have one-second resolution: a second backup in the
+            # same second overwrote the same .bak file, so refresh the head
+            # entry instead of recording a duplicate
+            entry["backups"][0][0] = mtime
+        else:
+            entry["backups"].insert(0, [mtime, backup_name])
+            entry["count"] += 1
         self._save_index(index)
+
+        return backup_path
     
     def recover_file(self, filename, backup_spec):
         """Recover file from backup"""
@@ -261,9 +474,12 @@ class FileManager:
         file_path = self._get_file_path(filename)
         
         # Copy backup to main file
-        shutil.copy2(backup_file, file_path)
+        _fast_copy(backup_file, file_path)
     
     def list_files(self):
-        """List all files"""
+        """List all files as a {filename: backup count} mapping"""
         index = self._load_index()
-        return index
\ No newline at end of file
+        return {
+            filename: entry["count"] if isinstance(entry, dict) else entry
+            for filename, entry in index.items()
+        }
\ No newline at end of file
@@ -3,57 +3,229 @@
 Vault management module
 """
 
+import io
 import json
+import mmap
+import os
+import threading
 import zipfile
 import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _read_bytes(path):
+    """Read a file's raw contents (worker for parallel dumps)"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+class _MmapReader(io.RawIOBase):
+    """Seekable file-like view over an mmap.
+
+    mmap itself only grew the full IOBase protocol (seekable etc.) in
+    recent Pythons; this thin adapter is what ZipFile actually talks to.
+    """
+
+    def __init__(self, mapped):
+        self._mapped = mapped
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buf):
+        data = self._mapped.read(len(buf))
+        buf[:len(data)] = data
+        return len(data)
+
+    def seek(self, pos, whence=os.SEEK_SET):
+        self._mapped.seek(pos, whence)
+        return self._mapped.tell()
+
+    def tell(self):
+        return self._mapped.tell()
+
+def _delete_tree(path):
+    """Remove a directory tree with unlinks spread across a thread pool.
+
+    shutil.rmtree deletes serially; unlink latency (worst on network
+    filesystems) hides well behind concurrent workers. Directories are
+    removed bottom-up afterwards.
+    """
+    # Refuse a symlink root like shutil.rmtree does: os.walk would follow
+    # it and empty out the link target instead of the link
+    if os.path.islink(path):
+        raise OSError(f"Cannot call _delete_tree on a symbolic link: {path}")
+    files = []
+    dirs = []
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirs.append(dirpath)
+        for dirname in list(dirnames):
+            full = os.path.join(dirpath, dirname)
+            # Symlinked dirs must be unlinked, not descended into
+            if os.path.islink(full):
+                dirnames.remove(dirname)
+                files.append(full)
+        files.extend(os.path.join(dirpath, f) for f in filenames)
+
+    if files:
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for _ in executor.map(os.unlink, files):
+                pass
+    for dirpath in reversed(dirs):
+        os.rmdir(dirpath)
+
+def _open_zip_mmap(zip_path):
+    """Open a zip archive over a read-only memory map.
+
+    The page cache then serves member reads directly instead of going
+    through buffered read() syscalls. Returns (ZipFile, mmap); the caller
+    owns closing both.
+    """
+    with open(zip_path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+        mapped.madvise(mmap.MADV_SEQUENTIAL)
+    return zipfile.ZipFile(_MmapReader(mapped), 'r'), mapped
+
+# Members at or above this size are streamed through the archive in 1 MiB
+# chunks instead of being buffered whole in memory
+_STREAM_THRESHOLD = 8 << 20
+
+_COPY_BUFSIZE = 1 << 20
+
+# Resolved once: expanduser parses passwd/env on every call, and the CLI
+# constructs a VaultManager per invocation
+_BASE_DIR = Path(os.path.expanduser("~/.local/lib/tvault"))
+
+def _scandir_files(root):
+    """Yield DirEntry objects for every regular file under root.
+
+    Recursing through os.scandir serves is_file/is_dir from the cached
+    directory entries instead of issuing a stat per path the way
+    Path.rglob('*') does. Entries are ordered by name within each
+    directory so archives built from the walk are deterministic; the sort
+    compares name strings (C-level), never Path objects, and the walk as a
+    whole stays streaming - don't replace it with sorted(rglob('*')),
+    which materializes and tuple-compares a Path per file.
+    """
+    with os.scandir(root) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scandir_files(entry.path)
+            elif entry.is_file():
+                # Follows file symlinks, matching the rglob walk this
+                # replaced: a linked file's content belongs in the dump
+                yield entry
+
 class VaultManager:
     """Manage multiple data directories (vaults)"""
     
     def __init__(self):
         """Initialize vault manager"""
-        self.base_dir = Path.home() / ".local" / "lib" / "tvault"
-        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.base_dir = _BASE_DIR
+        if not self.base_dir.is_dir():
+            self.base_dir.mkdir(parents=True, exist_ok=True)
         
         self.vaults_file = self.base_dir / "vaults.json"
         self.current_file = self.base_dir / "current.txt"
-        
-        # Initialize default vault if not exists
-        self._init_default_vault()
-    
+
+        # Parsed vaults.json, keyed by the file's mtime for invalidation
+        self._vaults_cache = None
+        self._vaults_mtime = -1
+
     def _init_default_vault(self):
-        """Initialize default vault if needed"""
-        if not self.vaults_file.exists():
-            default_vault_path = self.base_dir / "default"
-            default_vault_path.mkdir(parents=True, exist_ok=True)
-            
-            vaults = {"default": str(default_vault_path)}
-            self._save_vaults(vaults)
+        """Seed vaults.json with the default vault and return the dict"""
+        default_vault_path = self.base_dir / "default"
+        default_vault_path.mkdir(parents=True, exist_ok=True)
+
+        vaults = {"default": str(default_vault_path)}
+        self._save_vaults(vaults)
+        return vaults
     
     def _load_vaults(self):
-        """Load vaults from JSON file"""
-        if not self.vaults_file.exists():
-            return {}
-        
-        with open(self.vaults_file, 'r') as f:
-            return json.load(f)
-    
+        """Load vaults from JSON file.
+
+        The parsed dict is cached against the file's mtime so repeated
+        calls in one process skip the read and JSON parse; any external
+        rewrite of vaults.json bumps the mtime and invalidates the cache.
+        """
+        try:
+            mtime = os.stat(self.vaults_file).st_mtime_ns
+        except FileNotFoundError:
+            # First run: seed the registry on demand instead of paying a
+            # mkdir/probe pair in every __init__
+            return self._init_default_vault()
+        if self._vaults_cache is not None and mtime == self._vaults_mtime:
+            return self._vaults_cache
+
+        with open(self.vaults_file, 'rb') as f:
+            data = f.read()
+        vaults = orjson.loads(data) if orjson else json.loads(data)
+        self._vaults_cache = vaults
+        self._vaults_mtime = mtime
+        return vaults
+
     def _save_vaults(self, vaults):
-        """Save vaults to JSON file"""
-        with open(self.vaults_file, 'w') as f:
-            json.dump(vaults, f, indent=2)
+        """Save vaults to JSON file atomically (tempfile + os.replace)"""
+        if orjson:
+            data = orjson.dumps(vaults, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(vaults, indent=2).encode('utf-8')
+        tmp_file = self.vaults_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, self.vaults_file)
+        self._vaults_cache = vaults
+        self._vaults_mtime = os.stat(self.vaults_file).st_mtime_ns
+
+        # Keep the name-only sidecar in sync for membership checks that
+        # don't need paths; same tempfile + os.replace idiom as above so a
+        # concurrent reader never sees a truncated file
+        names_file = self.base_dir / ".vault_names"
+        tmp_names = names_file.with_suffix('.tmp')
+        with open(tmp_names, 'w') as f:
+            f.write("\n".join(vaults))
+        os.replace(tmp_names, names_file)
+
+    def _list_vault_names(self):
+        """Get the set of vault names without parsing vaults.json.
+
+        Served from the .vault_names sidecar when it is at least as new as
+        the registry; otherwise (sidecar missing or vaults.json edited
+        externally) falls back to the full load.
+        """
+        names_file = self.base_dir / ".vault_names"
+        try:
+            if os.stat(names_file).st_mtime_ns >= os.stat(self.vaults_file).st_mtime_ns:
+                with open(names_file) as f:
+                    return set(f.read().splitlines())
+        except FileNotFoundError:
+            pass
+        return set(self._load_vaults())
     
     def _get_current_vault_info(self):
         """Get current vault name and path"""
-        if not self.current_file.exists():
+        try:
+            data = self.current_file.read_text()
+        except FileNotFoundError:
             return None
-        
-        with open(self.current_file, 'r') as f:
-            lines = f.read().strip().split('\n')
-            if len(lines) >= 2:
-                return {"name": lines[0], "path": lines[1]}
+
+        # Fixed two-line format: one partition pass per line instead of
+        # strip/split/index over the whole blob
+        name, sep, rest = data.partition('\n')
+        path, _, _ = rest.partition('\n')
+        if sep and path:
+            return {"name": name, "path": path.rstrip()}
         return None
     
     def add_vault(self, name, path):
@@ -102,7 +274,7 @@ class VaultManager:
         
         # Delete from disk
         if path.exists():
-            shutil.rmtree(path)
+            _delete_tree(path)
         
         # Remove from vaults
         del vaults[name]
@@ -116,9 +288,11 @@ class VaultManager:
             raise ValueError(f"Vault '{name}' not found")
         
         path = Path(vaults[name])
-        if not path.exists():
+        try:
+            os.stat(path)
+        except FileNotFoundError:
             raise ValueError(f"Vault path does not exist: {path}")
-        
+
         # Save current vault
         with open(self.current_file, 'w') as f:
             f.write(f"{name}\n{path}\n")
@@ -133,8 +307,8 @@ class VaultManager:
         if not info:
             return None
         
-        vaults = self._load_vaults()
-        if info["name"] not in vaults:
+        # Membership check only needs names, not the full registry
+        if info["name"] not in self._list_vault_names():
             return None
         
         return {
@@ -142,8 +316,15 @@ class VaultManager:
             "path": Path(info["path"])
         }
     
-    def dump_vault(self, name, target_path):
-        """Export a vault to zip file"""
+    def dump_vault(self, name, target_path,
+                   compression=zipfile.ZIP_DEFLATED, compresslevel=1):
+        """Export a vault to zip file.
+
+        compression/compresslevel are passed straight to zipfile.ZipFile.
+        The default is DEFLATE at level 1: vault files are small text, so
+        the few percent of extra size over level 6 is a fair trade for the
+        much cheaper compression on export.
+        """
         vaults = self._load_vaults()
         
         if name not in vaults:
@@ -155,12 +336,54 @@ class VaultManager:
         
         target_path = Path(target_path).expanduser().resolve()
         
-        # Create zip file
-        with zipfile.ZipFile(target_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in source_path.rglob('*'):
-                if file_path.is_file():
-                    arcname = file_path.relative_to(source_path)
-                    zipf.write(file_path, arcname)
+        # Create zip file. File reads are fanned out to a thread pool (the
+        # GIL is released around the blocking I/O) while members are
+        # appended to the archive in walk order on this thread; the pending
+        # window is bounded so memory stays flat on large vaults.
+        max_workers = min(8, os.cpu_count() or 1)
+        # Arcnames are slices of entry.path past the source prefix; no
+        # per-entry PurePath parsing
+        prefix_len = len(os.fspath(source_path)) + 1
+        # A 4 MiB output buffer coalesces the small writes DEFLATE flushes
+        # produce into large sequential ones
+        with open(target_path, 'wb', buffering=4 << 20) as raw, \
+                zipfile.ZipFile(raw, 'w', compression, allowZip64=True,
+                                compresslevel=compresslevel) as zipf, \
+                ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            for entry in _scandir_files(source_path):
+                arcname = entry.path[prefix_len:]
+                if os.sep != '/':
+                    arcname = arcname.replace(os.sep, '/')
+                if entry.stat().st_size >= _STREAM_THRESHOLD:
+                    # Stream big members in 1 MiB chunks instead of holding
+                    # them in memory; force_zip64 writes the zip64 local
+                    # header up front so members over 2 GiB never need a
+                    # header rewrite (or fail outright)
+                    info = zipfile.ZipInfo.from_file(entry.path, arcname)
+                    info.compress_type = compression
+                    # ZipFile.open only inherits the archive's level when
+                    # given a name, not a ZipInfo; without this the big
+                    # members silently compress at zlib's default level
+                    info._compresslevel = compresslevel
+                    with open(entry.path, 'rb') as src, \
+                            zipf.open(info, 'w', force_zip64=True) as dst:
+                        shutil.copyfileobj(src, dst, _COPY_BUFSIZE)
+                    continue
+                # Build the ZipInfo from the source file so small members
+                # keep their mtime and mode like the streamed ones do (a
+                # bare arcname would stamp dump time and 0600, making two
+                # dumps of an unchanged vault differ)
+                info = zipfile.ZipInfo.from_file(entry.path, arcname)
+                info.compress_type = compression
+                info._compresslevel = compresslevel
+                pending.append((info, executor.submit(_read_bytes, entry.path)))
+                if len(pending) > max_workers * 2:
+                    info, future = pending.popleft()
+                    zipf.writestr(info, future.result())
+            while pending:
+                info, future = pending.popleft()
+                zipf.writestr(info, future.result())
     
     def import_vault(self, zip_path, target_path):
         """Import a zip file as vault"""
@@ -172,10 +395,62 @@ class VaultManager:
         if target_path.exists():
             raise ValueError(f"Target path already exists: {target_path}")
         
-        # Extract zip
+        # Extract zip. Members are decompressed on a thread pool - zlib
+        # releases the GIL - with one ZipFile handle per worker thread so
+        # reads don't contend on a shared file position.
         target_path.mkdir(parents=True)
         with zipfile.ZipFile(zip_path, 'r') as zipf:
-            zipf.extractall(target_path)
+            infos = zipf.infolist()
+
+        target_str = os.path.realpath(target_path)
+        target_prefix = target_str + os.sep
+
+        # Create every member directory up front in one pass so workers
+        # never repeat mkdir/exists probes per file. Each directory gets the
+        # same escape check as the members themselves: this pass runs before
+        # any worker validates anything, so an unchecked makedirs here would
+        # let a '..' dir entry create directories outside the target.
+        file_infos = [info for info in infos if not info.is_dir()]
+        dir_names = {os.path.dirname(info.filename) for info in file_infos}
+        dir_names.update(info.filename.rstrip('/') for info in infos if info.is_dir())
+        for dir_name in sorted(dir_names):
+            if dir_name:
+                dest_dir = os.path.realpath(os.path.join(target_str, dir_name))
+                if dest_dir != target_str and not dest_dir.startswith(target_prefix):
+                    raise ValueError(f"Unsafe path in zip archive: {dir_name}")
+                os.makedirs(dest_dir, exist_ok=True)
+
+        thread_state = threading.local()
+        handles = []
+        handles_lock = threading.Lock()
+
+        def _extract_one(info):
+            zipf = getattr(thread_state, "zipf", None)
+            if zipf is None:
+                zipf, mapped = _open_zip_mmap(zip_path)
+                thread_state.zipf = zipf
+                with handles_lock:
+                    handles.append(zipf)
+                    handles.append(mapped)
+
+            # Manual copy with a 1 MiB buffer instead of ZipFile.extract's
+            # default; reject members that would escape the target dir
+            dest = os.path.realpath(os.path.join(target_str, info.filename))
+            if not dest.startswith(target_prefix):
+                raise ValueError(f"Unsafe path in zip archive: {info.filename}")
+            # Unbuffered destination: the copy already moves 1 MiB chunks,
+            # so a BufferedWriter layer would only add a memcpy per chunk
+            with zipf.open(info) as src, open(dest, 'wb', buffering=0) as dst:
+                shutil.copyfileobj(src, dst, _COPY_BUFSIZE)
+
+        try:
+            with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+                # Consume the iterator so worker exceptions propagate
+                for _ in executor.map(_extract_one, file_infos):
+                    pass
+        finally:
+            for handle in handles:
+                handle.close()
         
         # Generate vault name from target path
         vault_name = target_path.name
@@ -183,11 +458,12 @@ class VaultManager:
         # Add to vaults
         vaults = self._load_vaults()
         if vault_name in vaults:
-            # Add suffix if name exists
-            i = 1
-            while f"{vault_name}_{i}" in vaults:
-                i += 1
-            vault_name = f"{vault_name}_{i}"
+            # Pick the next free numeric suffix in one pass over the dict
+            prefix = f"{vault_name}_"
+            plen = len(prefix)
+            used = [int(name[plen:]) for name in vaults
+                    if name.startswith(prefix) and name[plen:].isdigit()]
+            vault_name = f"{vault_name}_{max(used) + 1 if used else 1}"
         
         vaults[vault_name] = str(target_path)
         self._save_vaults(vaults)